@@ -26,9 +26,12 @@ from .core import (
     clear_runtime_state,
     depsgraph_update_handler,
     first_user_collection,
-    forget_fingerprint,
-    linked_meshes_for_source,
+    invalidate_link_index,
+    iter_linked_meshes,
+    link_settings_changed,
+    link_source_changed,
     load_post_handler,
+    undo_post_handler,
     update_now_by_name,
 )
 ### Properties
@@ -56,17 +59,20 @@ class N2M_LinkProps(PropertyGroup):
     source: PointerProperty(
         name="Source",
         type=bpy.types.Object,
-        description="Linked NURBS/Curve/Surface source object"
+        description="Linked NURBS/Curve/Surface source object",
+        update=link_source_changed,
     )
     auto_update: BoolProperty(
         name="Auto Update",
         description="Regenerate mesh when source geometry changes",
-        default=True
+        default=True,
+        update=link_settings_changed,
     )
     debounce: FloatProperty(
         name="Debounce (s)",
         description="Wait time after last change before updating",
-        min=0.0, default=0.25, subtype='TIME'
+        min=0.0, default=0.25, subtype='TIME',
+        update=link_settings_changed,
     )
     apply_modifiers: BoolProperty(
         name="Apply Modifiers from Source",
@@ -154,17 +160,19 @@ class N2M_OT_update_now(Operator):
 
     def execute(self, context):
         obj = context.object
+        # A manual refresh should also heal any drift in the cached link index.
+        invalidate_link_index()
         # If active is a mesh link, update that one; if a curve/surface, update its targets.
-        if obj and obj.type == 'MESH' and getattr(obj, "n2m", None) and obj.n2m.source:
+        if obj and obj.type == 'MESH' and obj.n2m.source:
             src = obj.n2m.source
             if src and getattr(src, 'name', None):
-                update_now_by_name(src.name, include_disabled=True)
+                update_now_by_name(src.name, include_disabled=True, force=True)
             else:
                 self.report({'ERROR'}, 'Linked source is missing')
                 return {'CANCELLED'}
             return {'FINISHED'}
         if obj and obj.type in {'CURVE', 'SURFACE'}:
-            update_now_by_name(obj.name, include_disabled=True)
+            update_now_by_name(obj.name, include_disabled=True, force=True)
             return {'FINISHED'}
         self.report({'ERROR'}, "Select a linked mesh or its NURBS/Curve/Surface source")
         return {'CANCELLED'}
@@ -176,13 +184,12 @@ class N2M_OT_unlink(Operator):
 
     def execute(self, context):
         obj = context.object
-        if obj is None or obj.type != 'MESH' or not getattr(obj, "n2m", None) or not obj.n2m.source:
+        if obj is None or obj.type != 'MESH' or not obj.n2m.source:
             self.report({'ERROR'}, "Select a linked mesh to unlink")
             return {'CANCELLED'}
-        src = obj.n2m.source
+        # The source callback drops this mesh's built fingerprint; the source
+        # keeps its cached state for any meshes still linked to it.
         obj.n2m.source = None
-        if src and getattr(src, 'name', None):
-            forget_fingerprint(src.name)
         self.report({'INFO'}, "Unlinked mesh from source")
         return {'FINISHED'}
 
@@ -200,11 +207,7 @@ class N2M_PT_panel(Panel):
         o = context.object
         if o is None:
             return False
-        if o.type in {'CURVE', 'SURFACE'}:
-            return True
-        if o.type == 'MESH' and hasattr(o, "n2m"):
-            return True
-        return False
+        return o.type in {'CURVE', 'SURFACE', 'MESH'}
 
     def draw(self, context):
         layout = self.layout
@@ -212,19 +215,19 @@ class N2M_PT_panel(Panel):
         if o.type in {'CURVE', 'SURFACE'}:
             layout.operator(N2M_OT_link_mesh.bl_idname, text="Duplicate As Linked Mesh", icon='MESH_DATA')
             layout.separator()
-            targets = linked_meshes_for_source(o, include_disabled=True)
-            if targets:
-                col = layout.column(align=True)
-                col.label(text="Linked Meshes:")
-                for t in targets:
-                    row = col.row(align=True)
-                    row.prop(t.n2m, "auto_update", text="", icon='REC')
-                    row.label(text=t.name)
-                    row.operator(N2M_OT_update_now.bl_idname, text="", icon='FILE_REFRESH')
-            else:
+            col = None
+            for t in iter_linked_meshes(o, include_disabled=True):
+                if col is None:
+                    col = layout.column(align=True)
+                    col.label(text="Linked Meshes:")
+                row = col.row(align=True)
+                row.prop(t.n2m, "auto_update", text="", icon='REC')
+                row.label(text=t.name)
+                row.operator(N2M_OT_update_now.bl_idname, text="", icon='FILE_REFRESH')
+            if col is None:
                 layout.label(text="No linked meshes")
 
-        if o.type == 'MESH' and hasattr(o, "n2m"):
+        if o.type == 'MESH':
             box = layout.box()
             box.prop(o.n2m, "source")
             if o.n2m.source:
@@ -266,15 +269,19 @@ _CLASSES = (
     N2M_PT_panel,
 )
 
+_register_classes, _unregister_classes = bpy.utils.register_classes_factory(_CLASSES)
+
 def register():
     clear_runtime_state()
-    for c in _CLASSES:
-        bpy.utils.register_class(c)
+    _register_classes()
     bpy.types.Object.n2m = PointerProperty(type=N2M_LinkProps)
     if depsgraph_update_handler not in bpy.app.handlers.depsgraph_update_post:
         bpy.app.handlers.depsgraph_update_post.append(depsgraph_update_handler)
     if load_post_handler not in bpy.app.handlers.load_post:
         bpy.app.handlers.load_post.append(load_post_handler)
+    for handlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if undo_post_handler not in handlers:
+            handlers.append(undo_post_handler)
     global _MENU_DRAW_REGISTERED
     if not _MENU_DRAW_REGISTERED:
         bpy.types.VIEW3D_MT_object.append(_draw_object_menu)
@@ -293,7 +300,9 @@ def unregister():
         bpy.app.handlers.depsgraph_update_post.remove(depsgraph_update_handler)
     if load_post_handler in bpy.app.handlers.load_post:
         bpy.app.handlers.load_post.remove(load_post_handler)
+    for handlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if undo_post_handler in handlers:
+            handlers.remove(undo_post_handler)
     clear_runtime_state()
     del bpy.types.Object.n2m
-    for c in reversed(_CLASSES):
-        bpy.utils.unregister_class(c)
+    _unregister_classes()
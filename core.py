@@ -1,24 +1,33 @@
 """
 Core utilities for the NURBS2Mesh add-on.
 
-This module keeps runtime state (timers, fingerprints), exposes helper
+This module keeps runtime state (pending updates, fingerprints), exposes helper
 functions used by operators/UI, and defines the persistent handlers that
 coordinate automatic updates.
 """
 
 from __future__ import annotations
 
-import hashlib
+import pickle
 import struct
-from typing import Iterable, List, Optional
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Iterator, List, Optional
 
 import bpy
 from bpy.app.handlers import persistent
 from bpy.types import Object
 from mathutils import Matrix
 
+if TYPE_CHECKING:  # numpy is imported on first use to keep add-on startup light.
+    import numpy as np
+
 __all__ = [
     "linked_meshes_for_source",
+    "iter_linked_meshes",
+    "invalidate_link_index",
+    "link_source_changed",
+    "link_settings_changed",
     "first_user_collection",
     "build_mesh_from_source",
     "update_now_by_name",
@@ -26,31 +35,226 @@ __all__ = [
     "forget_fingerprint",
     "depsgraph_update_handler",
     "load_post_handler",
+    "undo_post_handler",
     "clear_runtime_state",
 ]
 
 
+# Object types that can act as a source.
+_SOURCE_TYPES = frozenset({"CURVE", "SURFACE"})
+
+# Mesh connectivity compared before geometry is copied into an existing mesh.
+_TOPOLOGY_FIELDS = (
+    ("edges", "vertices", 2),
+    ("loops", "vertex_index", 1),
+    ("polygons", "loop_start", 1),
+)
+
+# Attribute ``data_type`` -> (``foreach`` property, dtype, components).
+_ATTRIBUTE_LAYOUTS = {
+    "FLOAT": ("value", "float32", 1),
+    "INT": ("value", "int32", 1),
+    "INT8": ("value", "int8", 1),
+    "BOOLEAN": ("value", "bool", 1),
+    "FLOAT2": ("vector", "float32", 2),
+    "INT32_2D": ("value", "int32", 2),
+    "FLOAT_VECTOR": ("vector", "float32", 3),
+    "FLOAT_COLOR": ("color", "float32", 4),
+    "BYTE_COLOR": ("color", "float32", 4),
+    "QUATERNION": ("value", "float32", 4),
+}
+
+
 # Runtime state -------------------------------------------------------------
 
-_timers: dict[str, callable] = {}
-_fingerprints: dict[str, str] = {}
-_last_modes: dict[str, str] = {}
+# Sources waiting for the shared debounce timer: ``session_uid`` -> (last
+# known name, ``time.monotonic()`` deadline, whether modifier settings may
+# have changed, whether to rebuild regardless of fingerprints), plus when the
+# timer next fires.
+_pending: dict[int, tuple[str, float, bool, bool]] = {}
+_next_wake: Optional[float] = None
+# Seconds of rebuild work one timer tick may spend before yielding to the UI.
+_DRAIN_BUDGET = 0.005
+# Per-source state is keyed by ``session_uid`` so it survives renames.
+# Target ``session_uid`` -> (source fingerprint, apply modifiers, preserve
+# data layers) the linked mesh was last built with, least recently built first.
+_built_fingerprints: OrderedDict[int, tuple[bytes, bool, bool]] = OrderedDict()
+# At most this many entries are kept; losing one only costs a redundant rebuild.
+_BUILT_FINGERPRINT_LIMIT = 1024
+_last_modes: dict[int, str] = {}
+# Sources edited while none of their meshes needed geometry (hidden in the
+# viewport and from rendering); rebuilt once one of those meshes does again.
+_deferred: set[int] = set()
+# Object ``session_uid`` -> (modifier pointers, digest) of its modifier stack.
+_modifier_digests: dict[int, tuple[tuple[int, ...], bytes]] = {}
+
+# Source ``session_uid`` -> names of the mesh objects linked to it (kept in
+# insertion order for stable UI listings), plus the reverse mapping from a
+# target's ``session_uid`` to (source ``session_uid``, indexed target name)
+# so a target can be moved when its source pointer changes.
+_link_index: dict[int, dict[str, None]] = {}
+_linked_source: dict[int, tuple[int, str]] = {}
+# Curve datablock ``session_uid`` -> names of the source objects using it.
+_curve_users: dict[int, set[str]] = {}
+# Source ``session_uid`` -> shortest debounce among its auto-updating meshes;
+# reset whenever links or their settings change.
+_debounce_cache: dict[int, float] = {}
+_index_dirty = True
+# ``len(bpy.data.objects)`` when last seen; a change means objects were
+# added or removed without going through the source callback.
+_object_count = -1
+
+# Grow-only buffers reused by ``foreach_get``/``foreach_set`` copies.
+_scratch: dict[tuple[str, str], np.ndarray] = {}
+
+# Set while linked meshes are being rebuilt so the depsgraph updates caused
+# by writing them do not re-enter the handler.
+_in_update = False
 
 
 def clear_runtime_state() -> None:
     """Stop all scheduled timers and reset cached fingerprints."""
-    for fn in list(_timers.values()):
-        if bpy.app.timers.is_registered(fn):
-            bpy.app.timers.unregister(fn)
-    _timers.clear()
-    _fingerprints.clear()
+    global _index_dirty, _object_count, _next_wake
+    if bpy.app.timers.is_registered(_drain_pending):
+        bpy.app.timers.unregister(_drain_pending)
+    _pending.clear()
+    _next_wake = None
+    _built_fingerprints.clear()
     _last_modes.clear()
+    _deferred.clear()
+    _modifier_digests.clear()
+    _link_index.clear()
+    _linked_source.clear()
+    _curve_users.clear()
+    _debounce_cache.clear()
+    _scratch.clear()
+    _index_dirty = True
+    _object_count = -1
+
+
+def forget_fingerprint(src_uid: int) -> None:
+    """Remove cached state for a source object by ``session_uid``.
+
+    Built fingerprints are keyed by linked mesh and dropped by
+    ``link_source_changed`` or the next index rebuild instead.
+    """
+    _last_modes.pop(src_uid, None)
+    _deferred.discard(src_uid)
+    _modifier_digests.pop(src_uid, None)
+
 
+# Link index ----------------------------------------------------------------
+
+def _index_link(target: Object, src: Optional[Object]) -> None:
+    target_uid = target.session_uid
+    previous = _linked_source.pop(target_uid, None)
+    if previous is not None:
+        previous_uid, previous_name = previous
+        names = _link_index.get(previous_uid)
+        if names is not None:
+            names.pop(previous_name, None)
+            if not names:
+                del _link_index[previous_uid]
+    if src is not None:
+        src_uid = src.session_uid
+        target_name = target.name
+        _link_index.setdefault(src_uid, {})[target_name] = None
+        _linked_source[target_uid] = (src_uid, target_name)
+        data = src.data
+        if data is not None:
+            _curve_users.setdefault(data.session_uid, set()).add(src.name)
+
+
+def _rebuild_link_index() -> None:
+    """Rebuild the link and curve-user indices with a single pass over objects."""
+    global _index_dirty
+    _link_index.clear()
+    _linked_source.clear()
+    _curve_users.clear()
+    _debounce_cache.clear()
+    index_link = _index_link
+    for obj in bpy.data.objects:
+        # Reading ``obj.n2m`` allocates its property storage, so only touch
+        # objects that already carry link data.
+        if obj.type != "MESH" or not obj.is_property_set("n2m"):
+            continue
+        link_src = obj.n2m.source
+        if link_src is not None:
+            index_link(obj, link_src)
+    _index_dirty = False
+    _prune_unlinked_state()
+
+
+def _prune_unlinked_state() -> None:
+    """Drop cached state of objects the fresh link index no longer knows."""
+    for uid in [uid for uid in _built_fingerprints if uid not in _linked_source]:
+        del _built_fingerprints[uid]
+    # The remaining caches are keyed by source ``session_uid``.
+    for cache in (_last_modes, _modifier_digests):
+        for uid in [uid for uid in cache if uid not in _link_index]:
+            del cache[uid]
+    _deferred.intersection_update(_link_index)
+
+
+def invalidate_link_index() -> None:
+    """Force the link index to be rebuilt on its next use."""
+    global _index_dirty
+    _index_dirty = True
+
+
+def link_source_changed(link, _context) -> None:
+    """``update`` callback of ``N2M_LinkProps.source`` keeping the index current."""
+    obj = getattr(link, "id_data", None)
+    if obj is None:
+        return
+    # Whatever the mesh was built from, it was not this source.
+    _built_fingerprints.pop(obj.session_uid, None)
+    _debounce_cache.clear()
+    if not _index_dirty:
+        _index_link(obj, getattr(link, "source", None))
 
-def forget_fingerprint(src_name: str) -> None:
-    """Remove cached state for a source object by name."""
-    _fingerprints.pop(src_name, None)
-    _last_modes.pop(src_name, None)
+
+def link_settings_changed(_link, _context) -> None:
+    """``update`` callback of the link's debounce and auto-update settings."""
+    _debounce_cache.clear()
+
+
+def _collect_linked(src: Object, include_disabled: bool) -> tuple[List[Object], bool]:
+    objects = bpy.data.objects
+    result: List[Object] = []
+    stale = False
+    for name in _link_index.get(src.session_uid, ()):
+        obj = objects.get(name)
+        if obj is None or obj.type != "MESH" or obj.n2m.source != src:
+            stale = True
+            continue
+        if include_disabled or obj.n2m.auto_update:
+            result.append(obj)
+    return result, stale
+
+
+def _collect_curve_users(data) -> tuple[List[Object], bool]:
+    objects = bpy.data.objects
+    result: List[Object] = []
+    stale = False
+    for name in _curve_users.get(data.session_uid, ()):
+        obj = objects.get(name)
+        if obj is None or obj.data != data:
+            stale = True
+            continue
+        result.append(obj)
+    return result, stale
+
+
+def _sources_using_data(data) -> List[Object]:
+    """Return the linked source objects whose curve datablock is *data*."""
+    if _index_dirty:
+        _rebuild_link_index()
+    result, stale = _collect_curve_users(data)
+    if stale:
+        _rebuild_link_index()
+        result, _stale = _collect_curve_users(data)
+    return result
 
 
 # Geometry helpers ----------------------------------------------------------
@@ -63,42 +267,56 @@ def linked_meshes_for_source(
     """Return all mesh objects linked to *src* via the n2m property."""
     if src is None:
         return []
-    src_name = getattr(src, "name", None)
-    result: List[Object] = []
-    for obj in bpy.data.objects:
-        if obj.type != "MESH":
-            continue
-        link = getattr(obj, "n2m", None)
-        if not link or not getattr(link, "bl_rna", None):
-            continue
-        if not include_disabled and not getattr(link, "auto_update", False):
-            continue
-        link_src = getattr(link, "source", None)
-        if link_src == src:
-            result.append(obj)
-        elif src_name and getattr(link_src, "name", None) == src_name:
-            result.append(obj)
+    if _index_dirty:
+        _rebuild_link_index()
+    result, stale = _collect_linked(src, include_disabled)
+    if stale:
+        # A target was renamed, removed or relinked behind our back.
+        _rebuild_link_index()
+        result, _stale = _collect_linked(src, include_disabled)
     return result
 
 
+def iter_linked_meshes(
+    src: Optional[Object],
+    *,
+    include_disabled: bool = False,
+) -> Iterator[Object]:
+    """Lazily yield the mesh objects linked to *src*.
+
+    Cheaper than :func:`linked_meshes_for_source` for single-pass consumers
+    such as panel drawing; stale entries are skipped and repaired on the next
+    lookup instead of immediately.
+    """
+    global _index_dirty
+    if src is None:
+        return
+    if _index_dirty:
+        _rebuild_link_index()
+    objects = bpy.data.objects
+    for name in _link_index.get(src.session_uid, ()):
+        obj = objects.get(name)
+        if obj is None or obj.type != "MESH" or obj.n2m.source != src:
+            _index_dirty = True
+            continue
+        if include_disabled or obj.n2m.auto_update:
+            yield obj
+
+
 def first_user_collection(obj: Object, context: bpy.types.Context):
     """Return the first collection using *obj* or the scene collection."""
-    collections = getattr(obj, "users_collection", ())
-    if collections:
-        return collections[0]
-    return context.scene.collection
+    collections = obj.users_collection
+    return collections[0] if collections else context.scene.collection
 
 
 def _record_mode_transition(obj: Object) -> bool:
     """Return True when *obj* just exited Edit mode."""
-    if obj is None or getattr(obj, 'type', None) not in {'CURVE', 'SURFACE'}:
-        return False
-    name = getattr(obj, 'name', None)
-    if not name:
+    if obj is None or getattr(obj, 'type', None) not in _SOURCE_TYPES:
         return False
+    src_uid = obj.session_uid
     current = getattr(obj, 'mode', 'OBJECT')
-    previous = _last_modes.get(name)
-    _last_modes[name] = current
+    previous = _last_modes.get(src_uid)
+    _last_modes[src_uid] = current
     return previous == 'EDIT' and current != 'EDIT'
 
 
@@ -107,250 +325,865 @@ def build_mesh_from_source(
     *,
     apply_modifiers: bool = True,
     preserve_all: bool = True,
+    depsgraph: Optional[bpy.types.Depsgraph] = None,
 ) -> bpy.types.Mesh:
-    """Create a mesh datablock from ``src_obj`` respecting add-on settings."""
-    depsgraph = bpy.context.evaluated_depsgraph_get()
-    evaluated = src_obj.evaluated_get(depsgraph) if apply_modifiers else src_obj
+    """Create a mesh datablock from ``src_obj`` respecting add-on settings.
+
+    Pass ``depsgraph`` when converting several objects in a row so the
+    evaluated depsgraph is fetched only once.
+    """
+    if depsgraph is None:
+        depsgraph = bpy.context.evaluated_depsgraph_get()
     mesh = bpy.data.meshes.new_from_object(
-        evaluated,
+        _conversion_object(src_obj, apply_modifiers, depsgraph),
         preserve_all_data_layers=preserve_all,
         depsgraph=depsgraph if preserve_all else None,
     )
     return mesh
 
 
+def _conversion_object(
+    src_obj: Object,
+    apply_modifiers: bool,
+    depsgraph: bpy.types.Depsgraph,
+) -> Object:
+    """Return the object whose geometry a mesh conversion of ``src_obj`` reads."""
+    # Without modifiers the evaluated object already holds the raw conversion,
+    # so reuse it rather than having Blender re-evaluate the original.
+    if apply_modifiers or not src_obj.modifiers:
+        return src_obj.evaluated_get(depsgraph)
+    return src_obj
+
+
+def _sync_mesh_in_place(
+    mesh_obj: Object,
+    link,
+    depsgraph: bpy.types.Depsgraph,
+) -> bool:
+    """Refresh ``mesh_obj.data`` from a transient ``to_mesh`` conversion.
+
+    No datablock is created; returns False when the topology changed, the
+    mesh is shared with other users or the copy failed, and the caller has
+    to build and swap in a new mesh instead.
+    """
+    mesh = mesh_obj.data
+    if mesh is None or mesh.users != 1:
+        # Writing into a shared datablock would change its other users too.
+        return False
+    owner = _conversion_object(link.source, link.apply_modifiers, depsgraph)
+    preserve_all = link.preserve_all_data_layers
+    try:
+        transient = owner.to_mesh(
+            preserve_all_data_layers=preserve_all,
+            depsgraph=depsgraph if preserve_all else None,
+        )
+        return transient is not None and _copy_mesh_into_existing(mesh, transient)
+    except Exception as ex:  # pragma: no cover - Blender context dependent
+        # ``mesh`` may be half overwritten; the swapped-in mesh replaces it.
+        print(f"[NURBS2Mesh] In-place update failed for {mesh_obj.name}: {ex}")
+        return False
+    finally:
+        owner.to_mesh_clear()
+
+
 def _replace_object_mesh(obj_mesh: Object, new_mesh: bpy.types.Mesh) -> None:
     """Attach ``new_mesh`` to ``obj_mesh`` and release the previous datablock."""
     previous = obj_mesh.data
     obj_mesh.data = new_mesh
 
     if previous and getattr(previous, "materials", None) is not None:
-        new_mesh.materials.clear()
-        for material in previous.materials:
-            new_mesh.materials.append(material)
+        # Slice once so the loop walks a plain list, not the live collection.
+        materials = previous.materials[:]
+        if materials or len(new_mesh.materials):
+            new_mesh.materials.clear()
+            for material in materials:
+                new_mesh.materials.append(material)
 
     if previous and previous.users == 0:
         old_name = getattr(previous, "name", None)
-        bpy.data.meshes.remove(previous)
+        # Nothing references the datablock any more, so skip the unlink walk.
+        bpy.data.meshes.remove(previous, do_unlink=False)
         if old_name:
             new_mesh.name = old_name
 
 
+def _scratch_buffer(key: str, size: int, dtype) -> np.ndarray:
+    """Return a ``size`` item view of a reusable buffer that only ever grows."""
+    import numpy as np
+
+    dtype = np.dtype(dtype)
+    slot = (key, dtype.char)
+    buffer = _scratch.get(slot)
+    if buffer is None or buffer.size < size:
+        buffer = np.empty(max(size, 2 * buffer.size if buffer is not None else 0), dtype=dtype)
+        _scratch[slot] = buffer
+    return buffer[:size]
+
+
+def _read_array(collection, prop: str, components: int, dtype, key: str) -> np.ndarray:
+    values = _scratch_buffer(key, len(collection) * components, dtype)
+    collection.foreach_get(prop, values)
+    return values
+
+
+def _copyable_attributes(mesh: bpy.types.Mesh) -> Optional[dict]:
+    """Return the public attributes of *mesh* keyed by name, or None if unsupported."""
+    result = {}
+    for attr in mesh.attributes:
+        if attr.name.startswith("."):
+            continue
+        if attr.data_type not in _ATTRIBUTE_LAYOUTS:
+            return None
+        result[attr.name] = (attr.domain, attr.data_type)
+    return result
+
+
+def _copy_mesh_into_existing(dst: bpy.types.Mesh, src_mesh: bpy.types.Mesh) -> bool:
+    """Copy ``src_mesh`` into ``dst`` in place when both share the same topology.
+
+    Returns False without touching ``dst`` when connectivity or the attribute
+    layout differs; the caller then swaps datablocks instead.
+    """
+    for name in ("vertices", "edges", "loops", "polygons"):
+        if len(getattr(dst, name)) != len(getattr(src_mesh, name)):
+            return False
+    import numpy as np
+
+    for name, prop, components in _TOPOLOGY_FIELDS:
+        src_values = _read_array(getattr(src_mesh, name), prop, components, "int32", "src")
+        dst_values = _read_array(getattr(dst, name), prop, components, "int32", "dst")
+        if not np.array_equal(src_values, dst_values):
+            return False
+
+    layout = _copyable_attributes(src_mesh)
+    if layout is None or layout != _copyable_attributes(dst):
+        return False
+
+    for name, (_domain, data_type) in layout.items():
+        prop, dtype, components = _ATTRIBUTE_LAYOUTS[data_type]
+        values = _read_array(src_mesh.attributes[name].data, prop, components, dtype, "src")
+        dst.attributes[name].data.foreach_set(prop, values)
+    dst.update()
+    return True
+
+
 # Update orchestration ------------------------------------------------------
 
-def _float_bytes(value: float) -> bytes:
-    return struct.pack("<d", float(value))
+def _existing_fields(rna_type, fields):
+    """Keep the ``(name, width)`` pairs of *fields* that *rna_type* defines."""
+    available = rna_type.bl_rna.properties.keys()
+    return tuple(field for field in fields if field[0] in available)
+
+
+# Per-point float fields hashed for each kind of spline point, with their
+# component counts; read in bulk through ``foreach_get``. Filtered once
+# against the running Blender's RNA so the hot loop needs no probing.
+_BEZIER_POINT_FIELDS = _existing_fields(bpy.types.BezierSplinePoint, (
+    ("co", 3),
+    ("handle_left", 3),
+    ("handle_right", 3),
+    ("tilt", 1),
+    ("radius", 1),
+))
+_SPLINE_POINT_FIELDS = _existing_fields(bpy.types.SplinePoint, (
+    ("co", 4),
+    ("tilt", 1),
+    ("radius", 1),
+))
+_PROFILE_POINT_FIELDS = _existing_fields(bpy.types.CurveProfilePoint, (
+    ("location", 2),
+    ("handle_1", 2),
+    ("handle_2", 2),
+))
+# Floats gathered per point for each field list.
+_BEZIER_POINT_STRIDE = sum(width for _name, width in _BEZIER_POINT_FIELDS)
+_SPLINE_POINT_STRIDE = sum(width for _name, width in _SPLINE_POINT_FIELDS)
+_PROFILE_POINT_STRIDE = sum(width for _name, width in _PROFILE_POINT_FIELDS)
+
+
+# Enum values hashed on every fingerprint, encoded once.
+_ENCODED_ENUMS = {
+    value: value.encode()
+    for value in (
+        "2D", "3D", "BEZIER", "NURBS", "POLY", "SURFACE",
+        "ROUND", "OBJECT", "PROFILE", "FULL", "BACK", "FRONT", "HALF", "NONE",
+        "RESOLUTION", "SEGMENTS", "SPLINE",
+        "MINIMUM", "TANGENT", "Z_UP", "OVERRIDE", "MULTIPLY", "ADD",
+        "AUTO", "VECTOR", "FREE", "ALIGN",
+    )
+}
+
+# Curve settings that affect the generated mesh: resolution u/v, render
+# resolution u/v, bevel resolution, bevel depth, extrude, offset, twist
+# smoothing, bevel factor start/end, fill caps, fill deform, radius, stretch
+# and taper mapping.
+_CURVE_HEADER = struct.Struct("<5i6d5?")
+
+# Bevel profile settings hashed ahead of its points: clipping, even sampling,
+# straight-edge sampling and point count.
+_PROFILE_HEADER = struct.Struct("<3?i")
+
+# Per-spline settings hashed ahead of the points: cyclic u/v, endpoint u/v,
+# Bezier u/v, smooth shading, order u/v, resolution u/v, material index and
+# point count. The count keeps spline boundaries in the digest now that all
+# points are hashed as one buffer.
+_SPLINE_HEADER = struct.Struct("<7?6i")
+
+
+def _fill_points(points, count: int, fields, buffer: np.ndarray, offset: int) -> int:
+    """Copy *fields* of *points* into ``buffer`` from ``offset``, field after field.
+
+    Returns the offset just past the copied values.
+    """
+    for name, width in fields:
+        end = offset + count * width
+        points.foreach_get(name, buffer[offset:end])
+        offset = end
+    return offset
+
+
+# How a modifier property value is normalised before hashing.
+_PROP_PLAIN, _PROP_POINTER, _PROP_COLLECTION, _PROP_ARRAY, _PROP_ENUM_FLAG = range(5)
+
+_IGNORED_MODIFIER_PROPS = frozenset({
+    "rna_type",
+    "name",
+    "type",
+    "show_viewport",
+    "show_render",
+})
 
+# Modifier type -> sorted (identifier, kind) pairs of its hashed properties.
+# RNA definitions do not change during a session, so this is never reset.
+_modifier_property_cache: dict[str, tuple[tuple[str, int], ...]] = {}
 
-def _modifier_fingerprint(obj: Object) -> bytes:
+
+def _modifier_properties(mod) -> tuple[tuple[str, int], ...]:
+    """Return the writable properties of *mod* that feed its fingerprint."""
+    properties = _modifier_property_cache.get(mod.type)
+    if properties is not None:
+        return properties
+    entries = []
+    for prop in mod.bl_rna.properties:
+        identifier = prop.identifier
+        if prop.is_readonly or identifier in _IGNORED_MODIFIER_PROPS:
+            continue
+        if prop.type == "POINTER":
+            kind = _PROP_POINTER
+        elif prop.type == "COLLECTION":
+            kind = _PROP_COLLECTION
+        elif getattr(prop, "is_array", False):
+            kind = _PROP_ARRAY
+        elif prop.type == "ENUM" and prop.is_enum_flag:
+            kind = _PROP_ENUM_FLAG
+        else:
+            kind = _PROP_PLAIN
+        entries.append((identifier, kind))
+    properties = tuple(sorted(entries))
+    _modifier_property_cache[mod.type] = properties
+    return properties
+
+
+def _modifier_fingerprint(obj: Object, *, refresh: bool = True) -> bytes:
+    """Return a digest of the modifier stack of *obj*.
+
+    With ``refresh`` unset the digest cached for the same stack is reused;
+    callers pass that only when the update being handled cannot have touched
+    modifier settings.
+    """
     modifiers = getattr(obj, "modifiers", None)
     if not modifiers:
+        _modifier_digests.pop(obj.session_uid, None)
         return b""
 
-    parts: List[str] = []
-    for mod in modifiers:
-        entries: List[str] = [
-            mod.type,
-            "1" if getattr(mod, "show_viewport", True) else "0",
-        ]
-        if hasattr(mod, "show_render"):
-            entries.append("1" if mod.show_render else "0")
+    stack = tuple(mod.as_pointer() for mod in modifiers)
+    if not refresh:
+        cached = _modifier_digests.get(obj.session_uid)
+        if cached is not None and cached[0] == stack:
+            return cached[1]
 
+    stack_state = []
+    for mod in modifiers:
         properties = []
-        for prop in mod.bl_rna.properties:
-            if prop.is_readonly or prop.identifier in {
-                "rna_type",
-                "name",
-                "type",
-                "show_viewport",
-                "show_render",
-            }:
-                continue
+        for identifier, kind in _modifier_properties(mod):
             try:
-                value = getattr(mod, prop.identifier)
+                value = getattr(mod, identifier)
             except AttributeError:
                 continue
-            if prop.type == "POINTER":
+            if kind == _PROP_POINTER:
                 value = getattr(value, "name", None)
-            elif prop.type == "COLLECTION":
+            elif kind == _PROP_COLLECTION:
                 value = tuple(getattr(item, "name", None) for item in value)
-            properties.append((prop.identifier, value))
-        if properties:
-            entries.append(repr(sorted(properties)))
+            elif kind == _PROP_ARRAY:
+                value = tuple(value)
+            elif kind == _PROP_ENUM_FLAG:
+                value = tuple(sorted(value))
+            properties.append((identifier, value))
+        stack_state.append((
+            mod.type,
+            getattr(mod, "show_viewport", True),
+            getattr(mod, "show_render", None),
+            tuple(properties),
+        ))
+
+    state = tuple(stack_state)
+    try:
+        digest = pickle.dumps(state, protocol=5)
+    except (pickle.PicklingError, TypeError):
+        # Values such as multi-dimensional arrays may not pickle; fall back to text.
+        digest = repr(state).encode()
+    _modifier_digests[obj.session_uid] = (stack, digest)
+    return digest
+
 
-        parts.append("|".join(entries))
+# Constructor of the hasher backend, chosen on the first fingerprint.
+_hasher_factory = None
 
-    return "\u0001".join(parts).encode()
 
+def _select_hasher():
+    """Return the fastest available hasher constructor: xxh3, BLAKE3, then BLAKE2b.
 
-def _curve_fingerprint(src_obj: Object) -> Optional[str]:
+    Fingerprints only detect changes within a session, so a non-cryptographic
+    hash is sufficient. The optional backends are imported here rather than at
+    module load so an idle add-on never pays for them.
+    """
+    try:
+        import xxhash
+    except ImportError:  # pragma: no cover - depends on the Python environment
+        pass
+    else:
+        return xxhash.xxh3_128
+    try:
+        from blake3 import blake3
+    except ImportError:  # pragma: no cover - depends on the Python environment
+        pass
+    else:
+        return blake3
+    import hashlib
+
+    return lambda: hashlib.blake2b(digest_size=16)
+
+
+def _new_hasher():
+    """Return a new streaming hasher from the selected backend."""
+    global _hasher_factory
+    if _hasher_factory is None:
+        _hasher_factory = _select_hasher()
+    return _hasher_factory()
+
+
+def _curve_fingerprint(
+    src_obj: Object,
+    *,
+    refresh_modifiers: bool = True,
+    data_digests: Optional[dict[int, bytes]] = None,
+) -> Optional[bytes]:
+    """Return a digest of the curve data and modifier stack of ``src_obj``.
+
+    ``data_digests`` memoizes curve data digests by ``session_uid`` so
+    sources sharing one datablock hash its points only once per pass.
+    """
     data = getattr(src_obj, "data", None)
     if not isinstance(data, bpy.types.Curve):
         return None
 
-    hasher = hashlib.blake2b(digest_size=16)
-
-    for name in (
-        "dimensions",
-        "resolution_u",
-        "resolution_v",
-        "render_resolution_u",
-        "render_resolution_v",
-        "bevel_depth",
-        "bevel_resolution",
-        "extrude",
-        "offset",
-        "twist_smooth",
-        "use_fill_caps",
-        "use_fill_deform",
-    ):
-        if hasattr(data, name):
-            hasher.update(str(getattr(data, name)).encode())
+    if data_digests is None:
+        digest = _curve_data_digest(data)
+    else:
+        data_uid = data.session_uid
+        digest = data_digests.get(data_uid)
+        if digest is None:
+            digest = data_digests[data_uid] = _curve_data_digest(data)
+
+    modifiers = _modifier_fingerprint(src_obj, refresh=refresh_modifiers)
+    if not modifiers:
+        return digest
+    hasher = _new_hasher()
+    hasher.update(digest)
+    hasher.update(modifiers)
+    return hasher.digest()
+
+
+def _encoded(value: str) -> bytes:
+    return _ENCODED_ENUMS.get(value) or value.encode()
 
+
+def _hash_profile(hasher, profile: bpy.types.CurveProfile) -> None:
+    """Feed the settings, points and handle types of a bevel *profile*."""
+    points = profile.points
+    count = len(points)
+    hasher.update(_PROFILE_HEADER.pack(
+        profile.use_clip,
+        profile.use_sample_even,
+        profile.use_sample_straight_edges,
+        count,
+    ))
+    buffer = _scratch_buffer("profile", count * _PROFILE_POINT_STRIDE, "float32")
+    _fill_points(points, count, _PROFILE_POINT_FIELDS, buffer, 0)
+    hasher.update(memoryview(buffer))
+    hasher.update(b"\0".join(
+        _encoded(point.handle_type_1) + _encoded(point.handle_type_2)
+        for point in points
+    ))
+
+
+def _curve_data_digest(data: bpy.types.Curve, *, shapes: bool = True) -> bytes:
+    """Return a digest of the settings and points of curve datablock *data*.
+
+    With ``shapes`` set, the curve data of the bevel and taper objects is
+    folded in as well; their own bevel and taper objects are not followed.
+    """
+    hasher = _new_hasher()
+
+    hasher.update(b"\0".join((
+        _encoded(data.dimensions),
+        _encoded(data.bevel_mode),
+        _encoded(data.fill_mode),
+        _encoded(data.bevel_factor_mapping_start),
+        _encoded(data.bevel_factor_mapping_end),
+        _encoded(data.twist_mode),
+        _encoded(data.taper_radius_mode),
+    )))
+    for shape in (data.bevel_object, data.taper_object):
+        if shape is None:
+            hasher.update(b"\0")
+            continue
+        hasher.update(shape.name.encode())
+        shape_data = shape.data
+        if shapes and isinstance(shape_data, bpy.types.Curve):
+            hasher.update(_curve_data_digest(shape_data, shapes=False))
+    hasher.update(_CURVE_HEADER.pack(
+        data.resolution_u,
+        data.resolution_v,
+        data.render_resolution_u,
+        data.render_resolution_v,
+        data.bevel_resolution,
+        data.bevel_depth,
+        data.extrude,
+        data.offset,
+        data.twist_smooth,
+        data.bevel_factor_start,
+        data.bevel_factor_end,
+        data.use_fill_caps,
+        data.use_fill_deform,
+        data.use_radius,
+        data.use_stretch,
+        data.use_map_taper,
+    ))
+    profile = data.bevel_profile
+    if data.bevel_mode == "PROFILE" and profile is not None:
+        _hash_profile(hasher, profile)
+
+    # Headers are packed and the point collections sized in one pass, then all
+    # points are gathered into one scratch buffer and hashed with one update.
+    pack_header = _SPLINE_HEADER.pack
+    headers = []
+    sources = []
+    total = 0
     for spline in data.splines:
-        hasher.update(spline.type.encode())
-        for name in (
-            "use_cyclic_u",
-            "use_cyclic_v",
-            "order_u",
-            "order_v",
-            "resolution_u",
-            "resolution_v",
-        ):
-            if hasattr(spline, name):
-                hasher.update(str(getattr(spline, name)).encode())
-
-        if spline.type == "BEZIER" and hasattr(spline, "bezier_points"):
-            points: Iterable = spline.bezier_points
-            for point in points:
-                for vec in (point.handle_left, point.co, point.handle_right):
-                    for component in vec:
-                        hasher.update(_float_bytes(component))
-                hasher.update(_float_bytes(point.tilt))
-                hasher.update(_float_bytes(point.radius))
-        elif spline.type in {"NURBS", "POLY"} and hasattr(spline, "points"):
-            for point in spline.points:
-                for component in point.co:
-                    hasher.update(_float_bytes(component))
-                hasher.update(_float_bytes(getattr(point, "tilt", 0.0)))
-                hasher.update(_float_bytes(getattr(point, "radius", 1.0)))
-        elif spline.type == "SURFACE" and hasattr(spline, "points"):
-            for column in spline.points:
-                points = column if isinstance(column, (list, tuple)) else [column]
-                for point in points:
-                    for component in getattr(point, "co", (0.0, 0.0, 0.0, 0.0)):
-                        hasher.update(_float_bytes(component))
-                    hasher.update(_float_bytes(getattr(point, "tilt", 0.0)))
-                    hasher.update(_float_bytes(getattr(point, "radius", 1.0)))
-        elif hasattr(spline, "points"):
-            for point in spline.points:
-                for component in getattr(point, "co", (0.0, 0.0, 0.0, 0.0)):
-                    hasher.update(_float_bytes(component))
-                hasher.update(_float_bytes(getattr(point, "tilt", 0.0)))
-                hasher.update(_float_bytes(getattr(point, "radius", 1.0)))
-
-    hasher.update(_modifier_fingerprint(src_obj))
-    return hasher.hexdigest()
-
-
-def _geometry_changed(src_obj: Object) -> bool:
-    src_name = getattr(src_obj, "name", None)
-    if not src_name:
-        return False
-    fingerprint = _curve_fingerprint(src_obj)
-    if fingerprint is None:
-        return True
-    previous = _fingerprints.get(src_name)
-    if previous == fingerprint:
-        return False
-    _fingerprints[src_name] = fingerprint
-    return True
+        if spline.type == "BEZIER":
+            points, fields, stride = spline.bezier_points, _BEZIER_POINT_FIELDS, _BEZIER_POINT_STRIDE
+        else:
+            # Every other spline, surfaces included, keeps one flat ``points``
+            # collection of ``SplinePoint``.
+            points, fields, stride = spline.points, _SPLINE_POINT_FIELDS, _SPLINE_POINT_STRIDE
+        count = len(points)
+        headers.append(_encoded(spline.type))
+        headers.append(pack_header(
+            spline.use_cyclic_u,
+            spline.use_cyclic_v,
+            spline.use_endpoint_u,
+            spline.use_endpoint_v,
+            spline.use_bezier_u,
+            spline.use_bezier_v,
+            spline.use_smooth,
+            spline.order_u,
+            spline.order_v,
+            spline.resolution_u,
+            spline.resolution_v,
+            spline.material_index,
+            count,
+        ))
+        sources.append((points, count, fields))
+        total += count * stride
+    hasher.update(b"".join(headers))
+
+    # float32 matches Blender's storage, so ``foreach_get`` can copy directly.
+    buffer = _scratch_buffer("points", total, "float32")
+    offset = 0
+    for points, count, fields in sources:
+        offset = _fill_points(points, count, fields, buffer, offset)
+    hasher.update(memoryview(buffer))
+    return hasher.digest()
+
+
+def _min_debounce(src_obj: Object, targets: List[Object]) -> float:
+    """Return the shortest non-negative debounce among *targets* of *src_obj*."""
+    src_uid = src_obj.session_uid
+    cached = _debounce_cache.get(src_uid)
+    if cached is not None:
+        return cached
+    delay = targets[0].n2m.debounce
+    for target in targets[1:]:
+        if delay <= 0.0:
+            break
+        value = target.n2m.debounce
+        if value < delay:
+            delay = value
+    delay = max(delay, 0.0)
+    _debounce_cache[src_uid] = delay
+    return delay
+
+
+def _resolve_source(src_uid: int, src_name: str) -> Optional[Object]:
+    """Find a queued source again, following renames via its ``session_uid``."""
+    obj = bpy.data.objects.get(src_name)
+    if obj is not None and obj.session_uid == src_uid:
+        return obj
+    for obj in bpy.data.objects:
+        if obj.session_uid == src_uid:
+            return obj
+    return None
+
+
+def _drain_pending():
+    """Timer callback updating queued sources whose debounce has elapsed.
+
+    Work stops once ``_DRAIN_BUDGET`` is spent so the UI stays responsive;
+    sources still due are picked up on the next tick. Returns the delay
+    until the earliest remaining deadline so a single timer serves all sources.
+    """
+    global _next_wake
+    now = time.monotonic()
+    started = time.perf_counter()
+    depsgraph = None
+    # Linked duplicates share curve data; nothing edits it during this pass.
+    data_digests: dict[int, bytes] = {}
+    for src_uid, (src_name, deadline, refresh_modifiers, force) in list(_pending.items()):
+        if deadline > now:
+            continue
+        if depsgraph is not None and time.perf_counter() - started > _DRAIN_BUDGET:
+            break
+        del _pending[src_uid]
+        src = _resolve_source(src_uid, src_name)
+        if src is None:
+            forget_fingerprint(src_uid)
+            continue
+        if depsgraph is None:
+            depsgraph = bpy.context.evaluated_depsgraph_get()
+        _update_source(
+            src,
+            force=force,
+            depsgraph=depsgraph,
+            refresh_modifiers=refresh_modifiers,
+            data_digests=data_digests,
+        )
+    if not _pending:
+        _next_wake = None
+        return None
+    # Sources may have been queued again while the updates above ran.
+    _next_wake = min(entry[1] for entry in _pending.values())
+    return max(_next_wake - time.monotonic(), 0.0)
+
 
+def schedule_update(
+    src_obj: Optional[Object],
+    targets: Optional[List[Object]] = None,
+    *,
+    refresh_modifiers: bool = True,
+    force: bool = False,
+) -> Optional[float]:
+    """Debounce updates for ``src_obj`` using a single shared ``bpy.app.timers`` callback.
 
-def schedule_update(src_obj: Optional[Object]) -> Optional[float]:
-    """Debounce updates for ``src_obj`` using ``bpy.app.timers``."""
+    ``targets`` may pass the auto-updating meshes already looked up by the
+    caller. Clear ``refresh_modifiers`` when the edit cannot have touched
+    modifier settings, so the rebuild may reuse the cached stack digest.
+    Set ``force`` to rebuild even if the fingerprint still matches.
+    """
+    global _next_wake
     if src_obj is None:
         return None
 
-    src_name = src_obj.name
-    targets = linked_meshes_for_source(src_obj)
+    if targets is None:
+        targets = linked_meshes_for_source(src_obj)
     if not targets:
         return None
 
-    delay = min(max(t.n2m.debounce, 0.0) for t in targets)
-    if src_name in _timers:
-        existing = _timers.pop(src_name)
-        if bpy.app.timers.is_registered(existing):
-            bpy.app.timers.unregister(existing)
-
-    def _run():
-        try:
-            update_now_by_name(src_name)
-        finally:
-            _timers.pop(src_name, None)
-        return None
+    delay = _min_debounce(src_obj, targets)
+    # Each edit restarts the debounce window of its own source only.
+    now = time.monotonic()
+    deadline = now + delay
+    src_uid = src_obj.session_uid
+    queued = _pending.get(src_uid)
+    if queued is not None:
+        refresh_modifiers = refresh_modifiers or queued[2]
+        force = force or queued[3]
+    _pending[src_uid] = (src_obj.name, deadline, refresh_modifiers, force)
 
-    _timers[src_name] = _run
-    bpy.app.timers.register(_run, first_interval=delay)
+    if _next_wake is not None and _next_wake <= deadline:
+        # The timer wakes first and re-arms itself for this deadline. A wake
+        # time still ahead proves it is armed without asking Blender; a past
+        # one may belong to a drain that raised and was dropped.
+        if _next_wake > now or bpy.app.timers.is_registered(_drain_pending):
+            return delay
+    if bpy.app.timers.is_registered(_drain_pending):
+        bpy.app.timers.unregister(_drain_pending)
+    _next_wake = deadline
+    bpy.app.timers.register(_drain_pending, first_interval=delay)
     return delay
 
 
-def update_now_by_name(src_name: str, *, include_disabled: bool = False) -> None:
-    """Synchronise all linked meshes whose source matches ``src_name``."""
+def update_now_by_name(
+    src_name: str,
+    *,
+    include_disabled: bool = False,
+    force: bool = False,
+    depsgraph: Optional[bpy.types.Depsgraph] = None,
+) -> None:
+    """Synchronise all linked meshes whose source matches ``src_name``.
+
+    Unless ``force`` is set, the rebuild is skipped when the source geometry
+    still matches the fingerprint the meshes were last built from.
+    """
     src = bpy.data.objects.get(src_name)
     if src is None:
-        forget_fingerprint(src_name)
         return
+    _update_source(
+        src,
+        include_disabled=include_disabled,
+        force=force,
+        depsgraph=depsgraph,
+    )
+
 
+def _update_source(
+    src: Object,
+    *,
+    include_disabled: bool = False,
+    force: bool = False,
+    depsgraph: Optional[bpy.types.Depsgraph] = None,
+    refresh_modifiers: bool = True,
+    data_digests: Optional[dict[int, bytes]] = None,
+) -> None:
+    global _in_update
     targets = linked_meshes_for_source(src, include_disabled=include_disabled)
     if not targets:
         return
 
-    for mesh_obj in targets:
-        link = getattr(mesh_obj, "n2m", None)
-        if not link or not link.source:
-            continue
-        try:
-            mesh = build_mesh_from_source(
-                link.source,
-                apply_modifiers=link.apply_modifiers,
-                preserve_all=link.preserve_all_data_layers,
-            )
-            _replace_object_mesh(mesh_obj, mesh)
-            view_layer = getattr(bpy.context, "view_layer", None)
-            if view_layer and hasattr(view_layer, "update"):
-                view_layer.update()
-        except Exception as ex:  # pragma: no cover - Blender context dependent
-            print(f"[NURBS2Mesh] Update failed for {mesh_obj.name}: {ex}")
+    # Hashed once per debounced rebuild rather than on every depsgraph tick.
+    fingerprint = _curve_fingerprint(
+        src,
+        refresh_modifiers=refresh_modifiers or force,
+        data_digests=data_digests,
+    )
+
+    _in_update = True
+    try:
+        for mesh_obj in targets:
+            link = mesh_obj.n2m
+            if not link.source:
+                continue
+            target_uid = mesh_obj.session_uid
+            built = None
+            if fingerprint is not None:
+                built = (fingerprint, link.apply_modifiers, link.preserve_all_data_layers)
+                if not force and _built_fingerprints.get(target_uid) == built:
+                    # Already converted from this exact geometry and settings.
+                    continue
+            if depsgraph is None:
+                depsgraph = bpy.context.evaluated_depsgraph_get()
+            try:
+                if not _sync_mesh_in_place(mesh_obj, link, depsgraph):
+                    mesh = build_mesh_from_source(
+                        link.source,
+                        apply_modifiers=link.apply_modifiers,
+                        preserve_all=link.preserve_all_data_layers,
+                        depsgraph=depsgraph,
+                    )
+                    _replace_object_mesh(mesh_obj, mesh)
+                view_layer = getattr(bpy.context, "view_layer", None)
+                if view_layer and hasattr(view_layer, "update"):
+                    view_layer.update()
+            except Exception as ex:  # pragma: no cover - Blender context dependent
+                _built_fingerprints.pop(target_uid, None)
+                print(f"[NURBS2Mesh] Update failed for {mesh_obj.name}: {ex}")
+                continue
+            if built is not None:
+                _built_fingerprints[target_uid] = built
+                _built_fingerprints.move_to_end(target_uid)
+                if len(_built_fingerprints) > _BUILT_FINGERPRINT_LIMIT:
+                    _built_fingerprints.popitem(last=False)
+    finally:
+        _in_update = False
 
 
 # Handlers ------------------------------------------------------------------
 
+# Sources touched by the current depsgraph pass: ``session_uid`` -> [object,
+# geometry updated, modifiers may have changed].
+_Candidates = dict[int, list]
+
+
+def _add_candidate(
+    candidates: _Candidates,
+    obj: Object,
+    update,
+    refresh_modifiers: bool,
+) -> None:
+    geometry_updated = update.is_updated_geometry
+    entry = candidates.get(obj.session_uid)
+    if entry is None:
+        candidates[obj.session_uid] = [obj, geometry_updated, refresh_modifiers]
+        return
+    entry[1] = entry[1] or geometry_updated
+    entry[2] = entry[2] or refresh_modifiers
+
+
+def _handle_object_update(update, obj: Object, candidates: _Candidates) -> None:
+    global _index_dirty
+    obj_type = obj.type
+    if obj_type == "MESH":
+        # Duplicated or appended links never run the source callback.
+        if (
+            not _index_dirty
+            and obj.session_uid not in _linked_source
+            and obj.is_property_set("n2m")
+            and obj.n2m.source is not None
+        ):
+            _index_dirty = True
+    elif obj_type in _SOURCE_TYPES and obj.session_uid in _link_index:
+        _add_candidate(candidates, obj, update, True)
+
+
+def _handle_curve_update(update, data, candidates: _Candidates) -> None:
+    if not update.is_updated_geometry:
+        # Mode changes arrive as object updates, so nothing else here matters.
+        return
+    for obj in _sources_using_data(data):
+        if obj.type in _SOURCE_TYPES:
+            # Curve data updates come from point edits, never from modifier settings.
+            _add_candidate(candidates, obj, update, False)
+
+
+def _needs_geometry(target: Object) -> bool:
+    """Return True when *target* is shown in the viewport or may be rendered."""
+    return target.visible_get() or not target.hide_render
+
+
+def _flush_deferred() -> None:
+    """Schedule deferred sources once any of their meshes needs geometry again.
+
+    Runs on every handler pass: unhiding a collection or including it in the
+    view layer again does not reliably send an update for the mesh itself.
+    """
+    global _index_dirty
+    if _index_dirty:
+        _rebuild_link_index()
+    objects = bpy.data.objects
+    for src_uid in list(_deferred):
+        src = None
+        for name in _link_index.get(src_uid, ()):
+            target = objects.get(name)
+            candidate = target.n2m.source if target is not None else None
+            if candidate is not None and candidate.session_uid == src_uid:
+                src = candidate
+                break
+            # Renamed, deleted or relinked since it was indexed.
+            _index_dirty = True
+        if src is None:
+            _deferred.discard(src_uid)
+            continue
+        # Same targets and predicate as ``_check_source`` used to defer it.
+        targets = linked_meshes_for_source(src)
+        if any(_needs_geometry(target) for target in targets):
+            _deferred.discard(src_uid)
+            # Whatever changed while hidden is unknown, modifiers included.
+            schedule_update(src, targets, refresh_modifiers=True, force=True)
+
+
+def _check_source(obj: Object, geometry_updated: bool, refresh_modifiers: bool) -> None:
+    """Schedule a rebuild of *obj*'s meshes if this pass touched its geometry.
+
+    The depsgraph flags are trusted here and nothing is hashed; the debounced
+    rebuild compares fingerprints once the edits have settled.
+    """
+    mode_exit = _record_mode_transition(obj)
+    # Sources whose meshes all have auto-update off are never scheduled.
+    targets = linked_meshes_for_source(obj)
+    if not targets:
+        return
+    src_uid = obj.session_uid
+    if not any(_needs_geometry(target) for target in targets):
+        # Nobody can see or render the result; rebuild once a mesh needs it.
+        if geometry_updated or mode_exit:
+            _deferred.add(src_uid)
+        return
+    force = mode_exit
+    if src_uid in _deferred:
+        # Whatever changed while hidden is unknown, modifiers included.
+        _deferred.discard(src_uid)
+        geometry_updated = refresh_modifiers = force = True
+    if geometry_updated or mode_exit:
+        # Leaving Edit mode always rebuilds, whatever the fingerprint covers.
+        schedule_update(
+            obj,
+            targets,
+            refresh_modifiers=refresh_modifiers,
+            force=force,
+        )
+
+
+# Exact RNA class of an updated ID -> handler; surface objects use
+# ``SurfaceCurve`` data.
+_UPDATE_HANDLERS = {
+    bpy.types.Object: _handle_object_update,
+    bpy.types.Curve: _handle_curve_update,
+    bpy.types.SurfaceCurve: _handle_curve_update,
+}
+
+
 @persistent
 def depsgraph_update_handler(scene, depsgraph):
+    global _in_update, _index_dirty, _object_count
+    if _in_update:
+        return
+    if _deferred:
+        _flush_deferred()
     if not (depsgraph.id_type_updated("OBJECT") or depsgraph.id_type_updated("CURVE")):
         return
-    for update in depsgraph.updates:
-        data_id = update.id
-        if isinstance(data_id, bpy.types.Object):
-            if data_id.type in {"CURVE", "SURFACE"}:
-                mode_exit = _record_mode_transition(data_id)
-                geometry_changed = (
-                    update.is_updated_geometry and _geometry_changed(data_id)
-                )
-                if geometry_changed or mode_exit:
-                    schedule_update(data_id)
-        elif isinstance(data_id, bpy.types.Curve):
-            for obj in (
-                candidate
-                for candidate in bpy.data.objects
-                if candidate.type in {"CURVE", "SURFACE"} and candidate.data is data_id
-            ):
-                mode_exit = _record_mode_transition(obj)
-                if _geometry_changed(obj) or mode_exit:
-                    schedule_update(obj)
+    object_count = len(bpy.data.objects)
+    if object_count != _object_count:
+        _object_count = object_count
+        _index_dirty = True
+    if _index_dirty:
+        _rebuild_link_index()
+    if not _link_index:
+        # Nothing is linked; skip walking the updates entirely.
+        return
+    _in_update = True
+    try:
+        handlers = _UPDATE_HANDLERS
+        # A source usually shows up both as an object and as curve data; each
+        # one is fingerprinted and scheduled once per pass.
+        candidates: _Candidates = {}
+        for update in depsgraph.updates:
+            # Updates carry evaluated copies; the index and fingerprints track originals.
+            data_id = update.id.original
+            handler = handlers.get(type(data_id))
+            if handler is not None:
+                handler(update, data_id, candidates)
+        for obj, geometry_updated, refresh_modifiers in candidates.values():
+            _check_source(obj, geometry_updated, refresh_modifiers)
+    finally:
+        _in_update = False
 
 
 @persistent
 def load_post_handler(_dummy):
     clear_runtime_state()
+
+
+@persistent
+def undo_post_handler(_dummy):
+    global _index_dirty
+    _index_dirty = True